@@ -1,15 +1,127 @@
+from random import Random
 from typing import Optional
-from copy import deepcopy
+
+
+#Returns the positions adjacent to (row, col) on a board of the given size
+def _compute_neighbors(row: int, col: int,
+                       size: int) -> tuple[tuple[int, int], ...]:
+    neighbor_list: list[tuple[int, int]] = []
+
+    if row - 1 >= 0:
+        neighbor_list.append((row - 1, col))
+    if row + 1 < size:
+        neighbor_list.append((row + 1, col))
+    if col - 1 >= 0:
+        neighbor_list.append((row, col - 1))
+    if col + 1 < size:
+        neighbor_list.append((row, col + 1))
+
+    return tuple(neighbor_list)
+
+
+#Returns the bitboard of every position connected to seed through positions
+#in within, on a board of the given size and column masks. Everything the
+#loop reads is a local, so each ring of the flood is a handful of int ops
+def _flood_kernel(seed: int, within: int, size: int, not_first_col: int,
+                  not_last_col: int, all_mask: int) -> int:
+    region: int = seed
+    frontier: int = seed
+
+    while frontier:
+        frontier = (((frontier << 1) & not_first_col)
+                    | ((frontier >> 1) & not_last_col)
+                    | (frontier << size)
+                    | (frontier >> size)) & all_mask & within & ~region
+        region |= frontier
+
+    return region
+
+
+#Returns True if the flood of seed through positions in within touches a
+#position in target, stopping as soon as it does
+def _reaches_kernel(seed: int, within: int, target: int, size: int,
+                    not_first_col: int, not_last_col: int,
+                    all_mask: int) -> bool:
+    region: int = seed
+    frontier: int = seed
+
+    while frontier:
+        adjacent: int = (((frontier << 1) & not_first_col)
+                         | ((frontier >> 1) & not_last_col)
+                         | (frontier << size)
+                         | (frontier >> size)) & all_mask
+        if adjacent & target:
+            return True
+        frontier = adjacent & within & ~region
+        region |= frontier
+
+    return False
+
+
 class Board:
 
-    _size: int 
-    board: list[list[Optional[int]]]
+    __slots__ = ("_size", "_occ", "_all_mask", "_not_first_col",
+                 "_not_last_col", "_edges", "_neighbors", "_neighbor_masks",
+                 "_zobrist_table", "_zobrist")
+
+    # Lookup tables shared by every board of the same size
+    _MASK_CACHE: dict[int,
+                      tuple[int, int, int, tuple[int, int, int, int]]] = {}
+    _NEIGHBOR_CACHE: dict[int, list[list[tuple[tuple[int, int], ...]]]] = {}
+    _NEIGHBOR_MASK_CACHE: dict[int, list[int]] = {}
+    _ZOBRIST_CACHE: dict[tuple[int, int], list[list[int]]] = {}
+
+    _size: int
+    _occ: list[int]
+    _all_mask: int
+    _not_first_col: int
+    _not_last_col: int
+    _edges: tuple[int, int, int, int]
+    _neighbors: list[list[tuple[tuple[int, int], ...]]]
+    _neighbor_masks: list[int]
+    _zobrist_table: list[list[int]]
+    _zobrist: int
 
 
     #Constructor
-    def __init__(self, s: int):
+    def __init__(self, s: int, players: int = 2):
         self._size = s
-        self.board = [[None] * s for i in range(s)]
+
+        # One bitboard per player: bit (row * size + col) is set when that
+        # player has a piece at (row, col)
+        self._occ = [0] * players
+
+        # The masks only depend on the size, so they are worked out once per
+        # size and every later board of that size reuses them
+        if s not in Board._MASK_CACHE:
+            all_mask: int = (1 << (s * s)) - 1
+            first_row: int = (1 << s) - 1
+            last_row: int = first_row << (s * (s - 1))
+            first_col: int = sum(1 << (r * s) for r in range(s))
+            last_col: int = first_col << (s - 1)
+            Board._MASK_CACHE[s] = (all_mask, ~first_col, ~last_col,
+                                    (first_row, last_row, first_col, last_col))
+        self._all_mask, self._not_first_col, self._not_last_col, \
+            self._edges = Board._MASK_CACHE[s]
+
+        if s not in Board._NEIGHBOR_CACHE:
+            Board._NEIGHBOR_CACHE[s] = [[_compute_neighbors(r, c, s)
+                                         for c in range(s)] for r in range(s)]
+            Board._NEIGHBOR_MASK_CACHE[s] = [self.spread(1 << i)
+                                             for i in range(s * s)]
+        self._neighbors = Board._NEIGHBOR_CACHE[s]
+        self._neighbor_masks = Board._NEIGHBOR_MASK_CACHE[s]
+
+        # Zobrist hashing: every (player, position) pair gets a random 64-bit
+        # key, and the hash of the board is the XOR of the keys of all its
+        # pieces, updated as pieces are placed and removed
+        if (s, players) not in Board._ZOBRIST_CACHE:
+            rng: Random = Random(42)
+            Board._ZOBRIST_CACHE[(s, players)] = \
+                [[rng.getrandbits(64) for i in range(s * s)]
+                 for p in range(players)]
+        self._zobrist_table = Board._ZOBRIST_CACHE[(s, players)]
+        self._zobrist = 0
 
 
 
@@ -18,29 +130,103 @@ class Board:
     def size(self) -> int:
         return self._size
 
-    
+
+    #Returns the Zobrist hash of the board
+    @property
+    def zobrist(self) -> int:
+        return self._zobrist
+
+
     #Returns the piece at a given position
     def piece_at(self, row: int, col: int) -> Optional[int]:
 
-        if 0 <= row < self._size and 0 <= col < self._size: 
-            return self.board[row][col]
+        if 0 <= row < self._size and 0 <= col < self._size:
+            bit: int = 1 << (row * self._size + col)
+            for player, bits in enumerate(self._occ, 1):
+                if bits & bit:
+                    return player
+            return None
         else:
             raise ValueError
-    
-    def neighbors(self, row: int, col: int) -> set[tuple[int, int]]:
-        neighbor_set: set[tuple[int, int]] = set()
-
-        if row - 1 >= 0:
-            neighbor_set.add((row - 1, col))
-        if row + 1 < self.size:
-            neighbor_set.add((row + 1, col))
-        if col - 1 >= 0:
-            neighbor_set.add((row, col - 1))
-        if col + 1 >= 0:
-            neighbor_set.add((row, col + 1))
-
-        return neighbor_set
-    
+
+    #Returns the positions adjacent to the given position
+    def neighbors(self, row: int, col: int) -> tuple[tuple[int, int], ...]:
+        return self._neighbors[row][col]
+
+
+    #Returns the bitboard of the positions adjacent to the given position
+    def neighbor_mask(self, row: int, col: int) -> int:
+        return self._neighbor_masks[row * self._size + col]
+
+
+    #Returns the bitboard of every position adjacent to a set bit in bits
+    def spread(self, bits: int) -> int:
+        s: int = self._size
+        return (((bits << 1) & self._not_first_col)
+                | ((bits >> 1) & self._not_last_col)
+                | (bits << s)
+                | (bits >> s)) & self._all_mask
+
+
+    #Returns the bitboard of the chain of pieces connected to a position
+    def group_at(self, row: int, col: int) -> int:
+        piece: Optional[int] = self.piece_at(row, col)
+        if piece is None:
+            return 0
+
+        return self.flood(1 << (row * self._size + col), self._occ[piece - 1])
+
+
+    #Returns the bitboard of every position connected to bits through
+    #positions in within
+    def flood(self, bits: int, within: int) -> int:
+        return _flood_kernel(bits, within, self._size, self._not_first_col,
+                             self._not_last_col, self._all_mask)
+
+
+    #Returns True if the flood of bits through positions in within touches
+    #a position in target
+    def reaches(self, bits: int, within: int, target: int) -> bool:
+        return _reaches_kernel(bits, within, target, self._size,
+                               self._not_first_col, self._not_last_col,
+                               self._all_mask)
+
+
+    #Returns the bitboard with every position of the board set
+    def full(self) -> int:
+        return self._all_mask
+
+
+    #Returns the bitboards of the four edges of the board
+    def edge_masks(self) -> tuple[int, int, int, int]:
+        return self._edges
+
+
+    #Returns the bitboard of the pieces belonging to the given player
+    def pieces(self, piece: int) -> int:
+        return self._occ[piece - 1]
+
+
+    #Returns the bitboard of the positions with no piece on them
+    def empties(self) -> int:
+        occupied: int = 0
+        for bits in self._occ:
+            occupied |= bits
+        return self._all_mask & ~occupied
+
+
+    #Returns the positions of the set bits in bits, in row-major order
+    def positions(self, bits: int) -> list[tuple[int, int]]:
+        s: int = self._size
+        result: list[tuple[int, int]] = []
+
+        while bits:
+            lsb: int = bits & -bits
+            result.append(divmod(lsb.bit_length() - 1, s))
+            bits ^= lsb
+
+        return result
+
 
     #Places a piece at the given location
     def place_piece(self, row: int, col: int, piece: int | None) -> bool:
@@ -48,40 +234,127 @@ class Board:
         if row >= self._size or col >= self._size:
             raise ValueError
         elif self.piece_at(row, col) is None:
-            self.board[row][col] = piece
+            if piece is not None:
+                if not 1 <= piece <= len(self._occ):
+                    raise ValueError
+                index: int = row * self._size + col
+                self._occ[piece - 1] |= 1 << index
+                self._zobrist ^= self._zobrist_table[piece - 1][index]
             return True
         else:
             return False
-        
-    
+
+
     def remove_piece(self, row: int, col: int) -> None:
         if row >= self._size or col >= self._size:
             raise ValueError
         else:
-            self.board[row][col] = None
+            self.remove_pieces(1 << (row * self._size + col))
+
+
+    #Removes every piece whose bit is set in mask
+    def remove_pieces(self, mask: int) -> None:
+        for i in range(len(self._occ)):
+            removed: int = self._occ[i] & mask
+            if removed:
+                self._occ[i] ^= removed
+                keys: list[int] = self._zobrist_table[i]
+                while removed:
+                    lsb: int = removed & -removed
+                    self._zobrist ^= keys[lsb.bit_length() - 1]
+                    removed ^= lsb
+
+
+    #Returns an independent copy of the board
+    def copy(self) -> "Board":
+        new_board: Board = Board.__new__(Board)
+        new_board._size = self._size
+        new_board._occ = self._occ[:]
+        new_board._all_mask = self._all_mask
+        new_board._not_first_col = self._not_first_col
+        new_board._not_last_col = self._not_last_col
+        new_board._edges = self._edges
+        new_board._neighbors = self._neighbors
+        new_board._neighbor_masks = self._neighbor_masks
+        new_board._zobrist_table = self._zobrist_table
+        new_board._zobrist = self._zobrist
+        return new_board
+
+
+    #Overwrites this board with the contents of another board
+    def copy_from(self, other: "Board") -> None:
+        self._size = other._size
+        self._occ[:] = other._occ
+        self._all_mask = other._all_mask
+        self._not_first_col = other._not_first_col
+        self._not_last_col = other._not_last_col
+        self._edges = other._edges
+        self._neighbors = other._neighbors
+        self._neighbor_masks = other._neighbor_masks
+        self._zobrist_table = other._zobrist_table
+        self._zobrist = other._zobrist
+
+
+    #Puts the board back in a state returned by snapshot, given its hash
+    def restore(self, snapshot: tuple[int, ...], zobrist: int) -> None:
+        self._occ[:] = snapshot
+        self._zobrist = zobrist
+
+
+    #Returns an immutable snapshot of the board state
+    def snapshot(self) -> tuple[int, ...]:
+        return tuple(self._occ)
 
 
     #Returns matrix representation of the board
     def to_grid(self) -> list[list[Optional[int]]]:
-        board_copy: list[list[Optional[int]]] = deepcopy(self.board)
-        return board_copy
-    
+        s: int = self._size
+
+        # Fill one flat row-major list, then cut it into rows
+        flat: list[Optional[int]] = [None] * (s * s)
+
+        for player, bits in enumerate(self._occ, 1):
+            while bits:
+                lsb: int = bits & -bits
+                flat[lsb.bit_length() - 1] = player
+                bits ^= lsb
+
+        return [flat[i:i + s] for i in range(0, s * s, s)]
+
+
+    #Replaces the contents of the board with the given matrix
+    def load_grid(self, grid: list[list[Optional[int]]]) -> None:
+        if len(grid) != self._size or \
+                any(len(row) != self._size for row in grid):
+            raise ValueError
+
+        # Building the new bitboards and hash on the side, so the board is
+        # left untouched if the grid holds an invalid piece
+        occ: list[int] = [0] * len(self._occ)
+        zobrist: int = 0
+        index: int = 0
+        for row in grid:
+            for piece in row:
+                if piece is not None:
+                    if not 1 <= piece <= len(occ):
+                        raise ValueError
+                    occ[piece - 1] |= 1 << index
+                    zobrist ^= self._zobrist_table[piece - 1][index]
+                index += 1
+
+        self._occ = occ
+        self._zobrist = zobrist
+
     def __eq__(self, other: object):
-        if not isinstance(other, Board): 
+        if not isinstance(other, Board):
             return NotImplemented
-        
-        if not self.size == other.size:
+
+        # Boards with different hashes can't be equal
+        if self._zobrist != other._zobrist:
             return False
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                if not self.board[i][j] == other.board[i][j]:
-                    return False
-                
-        return True
-
-    def __hash__(self) -> int: 
-        value: int = 0
-        for row in self.board: 
-            value += hash(tuple(row))
-        return value
\ No newline at end of file
+
+        return self._size == other._size and self._occ == other._occ
+
+    def __hash__(self) -> int:
+        return self._zobrist
+
@@ -1,5 +1,6 @@
 import sys
-from random import randrange, choice
+from functools import partial
+from random import randrange
 from typing import Optional, Callable
 import click
 from base import GoBase
@@ -7,17 +8,103 @@ from fakes import GoStub, GoFake
 from go import Go
 
 
+# Transposition table for minimax_move, evicting the least recently used entry
+_TT: dict[tuple, tuple[float, int]] = {}
+_TT_MAX_ENTRIES: int = 100_000
+
+# Number of moves after which bot_battle ends a game by having both bots pass
+MAX_BATTLE_MOVES: int = 256
+
+
+def _position_key(base: GoBase) -> Optional[tuple]:
+    """
+    Returns a hashable key identifying the position of a game, along with
+    the board the ko rule forbids recreating. Returns None under superko,
+    where the legal moves depend on the whole history of the game.
+    """
+    ko_board: object
+    if isinstance(base, Go):
+        if base._superko:
+            return None
+        ko_board = base._prev_boards[0]
+    elif isinstance(base, GoFake):
+        if base._superko:
+            return None
+        ko_board = base._prev_snap_prev
+    else: # GoStub doesn't apply the ko rule
+        ko_board = None
+
+    snapshot: tuple
+    if isinstance(base, (Go, GoFake)):
+        snapshot = base.board.snapshot()
+    else:
+        snapshot = tuple(tuple(row) for row in base.grid)
+
+    return (type(base), base.size, base.turn, snapshot, ko_board)
+
+
+def _simulated_scores(base: GoBase, 
+                      move: Optional[tuple[int, int]]) -> dict[int, int]: 
+    """
+    Computes the scores after a move on any GoBase, by simulating it
+    """
+    return base.simulate_move(move).scores()
+
+
+def _average_reply_score(simulated_base: GoBase, 
+                         player: int) -> tuple[float, int]: 
+    """
+    Computes the average number of pieces the player has on the board after
+    each move the opponent could make in response, along with the number of
+    possible responses. Kept free of per-move bookkeeping, since it is the
+    innermost loop of minimax_move.
+    """
+    # Possible moves that the opponent can make as a result of applying this move
+    next_m: list[tuple[int, int]] = simulated_base.available_moves
+
+    if player == -1 or len(next_m) == 0: 
+        return (0, len(next_m))
+
+    score_after: Callable[[tuple[int, int]], dict[int, int]]
+    if isinstance(simulated_base, (Go, GoFake)):
+        score_after = simulated_base.score_after_move
+    else:
+        score_after = partial(_simulated_scores, simulated_base)
+
+    total: int = 0
+    for op_move in next_m:
+        total += score_after(op_move)[player]
+
+    return (total / len(next_m), len(next_m))
+
+
 ## Bot Strategies ##
 
 def random_move(base: GoBase) -> Optional[tuple[int, int]]: 
     """
-    Chooses a move randomly
+    Chooses a move randomly, among the legal moves and passing
     """
-    moves: list[Optional[tuple[int, int]]] = base.available_moves
-    # if (0, 0) in moves: 
-    #     moves.remove((0, 0))
-    moves.append(None) # The random bot can pass
-    return choice(moves)
+    candidates: list[tuple[int, int]]
+    if isinstance(base, (Go, GoFake)):
+        candidates = base.board.positions(base.board.empties())
+    else:
+        candidates = [(row, col) for row, pieces in enumerate(base.grid)
+                      for col, piece in enumerate(pieces) if piece is None]
+
+    # Picks uniformly among the empty positions and a pass, only checking 
+    # the legality of the picked position. Illegal picks are dropped before
+    # picking again, so every legal move stays equally likely.
+    while True:
+        index: int = randrange(len(candidates) + 1)
+        if index == len(candidates): 
+            return None # The random bot can pass
+
+        move: tuple[int, int] = candidates[index]
+        if base.legal_move(move): 
+            return move
+
+        candidates[index] = candidates[-1]
+        candidates.pop()
 
 def minimax_move(base: GoBase) -> Optional[tuple[int, int]]: 
     """
@@ -25,7 +112,7 @@ def minimax_move(base: GoBase) -> Optional[tuple[int, int]]:
     based on possible moves their opponent can make next. 
     Returns None if passed. 
     """
-    max_value: int = 0
+    max_value: float = 0
     best_move: Optional[tuple[int, int]] = None
 
     available_moves: list[Optional[tuple[int, int]]]= base.available_moves
@@ -36,24 +123,34 @@ def minimax_move(base: GoBase) -> Optional[tuple[int, int]]:
     for move in available_moves: 
 
         simulated_base: GoBase = base.simulate_move(move)
-
-        # Possible moves that the opponent can make as a result of applying this move
-        next_m: list[tuple[int, int]] = simulated_base.available_moves
-        # if (0, 0) in next_m: 
-        #     next_m.remove((0, 0))
-
-        # Average number of pieces on the board (for the player) after each opponent move
-        value_m: int = 0
-        for op_move in next_m:
-            next_simulated_base: GoBase = simulated_base.simulate_move(op_move)
-            if base.turn != -1: 
-                value_m += next_simulated_base.scores()[base.turn]
+        position: Optional[tuple] = _position_key(simulated_base)
+        entry: Optional[tuple[float, int]]
+
+        if position is None: # The position can't be cached
+            entry = _average_reply_score(simulated_base, base.turn)
+        else:
+            key: tuple = (base.turn, position)
+
+            # Taking the entry out and putting it back moves it to the end, 
+            # so the table stays in least recently used order
+            entry = _TT.pop(key, None)
+            if entry is None:
+                entry = _average_reply_score(simulated_base, base.turn)
+
+                if len(_TT) >= _TT_MAX_ENTRIES:
+                    del _TT[next(iter(_TT))] # Evicts the least recently used
+            _TT[key] = entry
+
+        value_m: float
+        num_replies: int
+        value_m, num_replies = entry
+
+        if isinstance(simulated_base, (Go, GoFake)):
+            simulated_base.recycle()
         
         # Case where applying this move would end the game (opponent has no available moves)
-        if len(next_m) == 0: 
+        if num_replies == 0: 
             return move
-        else: 
-            value_m /= len(next_m)
 
         if value_m > max_value: 
             max_value = value_m
@@ -82,37 +179,42 @@ def bot_battle(board_size: int,
         The next element is the number of ties. 
         Subsequent elements represent the number of wins per player. 
     """
-    outcome_tally: list[int] = [0, 0, 0, 0]
+    total_moves: int = 0
+    ties: int = 0
+    p1_wins: int = 0
+    p2_wins: int = 0
 
     for i in range(num_games):
         game = Go(board_size, 2)
-        total_moves = 0
+        apply_move = game.apply_move
+        game_moves: int = 0
 
-        while not game.done:
+        while not game.done and game_moves < MAX_BATTLE_MOVES:
             move1 = p1_strategy(game)
-            game.apply_move(move1)  # Bot 1 moves
+            apply_move(move1)  # Bot 1 moves
             move2 = p2_strategy(game)
-            game.apply_move(move2)   # Bot 2 moves
+            apply_move(move2)   # Bot 2 moves
 
             if move1 is None and move2 is None: 
                 break
 
-            total_moves+= 2
-            if total_moves >= 256: 
-                game.pass_turn()
-                game.pass_turn()
+            game_moves += 2
+
+        if not game.done: # Ran out of moves, so both bots pass
+            game.pass_turn()
+            game.pass_turn()
         
-        outcome_tally[0] += total_moves
+        total_moves += game_moves
 
         outcome: list[int] = game.outcome
-        if outcome == [1, 2]: # A tie
-            outcome_tally[1] += 1
-        if outcome == [1]: # Player 1 wins
-            outcome_tally[2] += 1
-        if outcome == [2]: # Player 2 wins
-            outcome_tally[3] += 1
+        if len(outcome) == 2: # A tie
+            ties += 1
+        elif outcome == [1]: # Player 1 wins
+            p1_wins += 1
+        elif outcome == [2]: # Player 2 wins
+            p2_wins += 1
     
-    return outcome_tally
+    return [total_moves, ties, p1_wins, p2_wins]
 
 
 @click.command()
@@ -40,6 +40,8 @@ class GoStub(GoBase):
     - It does not implement the load_game or simulate_moves method.
     """
 
+    __slots__ = ("_grid", "_turn", "_num_moves")
+
     _grid: BoardGridType
     _turn: int
     _num_moves: int
@@ -160,16 +162,29 @@ class GoStub(GoBase):
 #
 # Your GoFake implementation goes here
 #
+# Simulations handed back through GoFake.recycle, reused by simulate_move
+_sim_pool: list["GoFake"] = []
+_SIM_POOL_MAX: int = 64
+
+
 class GoFake(GoBase):
+
+    __slots__ = ("_turn", "_board", "_passes", "_game_over", "_prev_snaps",
+                 "_prev_snap_prev", "_cached_snap", "_snap_dirty",
+                 "_moves_cache")
     
     _side: int
     _players: int
     _superko: bool
-    _prev_boards: list[Board]
+    _prev_snaps: set[tuple[int, ...]]
+    _prev_snap_prev: tuple[int, ...]
+    _cached_snap: Optional[tuple[int, ...]]
+    _snap_dirty: bool
     _turn: int
     _board: Board
     _passes: int
     _game_over: bool
+    _moves_cache: dict[tuple, ListMovesType]
 
     def __init__(
         self,
@@ -201,7 +216,11 @@ class GoFake(GoBase):
         self._board = Board(side)
         self._passes = 0
         self._game_over = False
-        self._prev_boards = [Board(side), Board(side)]
+        self._prev_snaps = set()
+        self._prev_snap_prev = self._board.snapshot()
+        self._cached_snap = None
+        self._snap_dirty = True
+        self._moves_cache = {}
         
     
     # PROPERTIES
@@ -221,6 +240,13 @@ class GoFake(GoBase):
         """
         return self._players
 
+    @property
+    def board(self) -> Board: 
+        """
+        Returns the board object that represents the game board
+        """
+        return self._board
+
     @property
     def grid(self) -> list[list[Optional[int]]]:
         """
@@ -257,15 +283,18 @@ class GoFake(GoBase):
         If the game is over, this property will not return
         any meaningful value.
         """
-        moves: list[tuple[int, int]] = []
+        # The cache is cleared whenever a move is applied, so the turn and
+        # the board are enough to tell positions apart (a pass only changes
+        # the turn)
+        key: tuple = (self._turn, self._current_snapshot())
+        moves: Optional[ListMovesType] = self._moves_cache.get(key)
 
-        for row in range(self.size): 
-            for col in range(self.size):
-                if (self.legal_move((row, col)) and 
-                    self._board.piece_at(row, col) is None): 
-                    moves.append((row, col))
+        if moves is None:
+            moves = [pos for pos in self._board.positions(self._board.empties())
+                     if self.legal_move(pos)]
+            self._moves_cache[key] = moves
         
-        return moves
+        return list(moves)
 
     @property
     def done(self) -> bool:
@@ -349,20 +378,19 @@ class GoFake(GoBase):
         """
         row, col = pos
 
-        temp_base: "GoBase"  = self.simulate_move(pos)
-
         if not (0 <= row < self.size and 0 <= col < self.size):
             return False
         
         if self.piece_at((row, col)) is not None:
             return False
         
+        snap: tuple[int, int] = self._apply_bits(pos)
+
         if self._superko:
-            for prev in self._prev_boards:
-                if prev == temp_base._board:
-                    return False
+            if snap in self._prev_snaps:
+                return False
         else: # otherwise we are in ko case
-            if temp_base._board == self._prev_boards[0]:
+            if snap == self._prev_snap_prev:
                 return False
         
         return True      
@@ -396,6 +424,7 @@ class GoFake(GoBase):
             return 
         
         row, col = pos
+        self._moves_cache.clear()
 
         # Why did we have this? 
         # if self.done == True:
@@ -404,26 +433,78 @@ class GoFake(GoBase):
         if row == 0 and col == 0:
             self._board.place_piece(row, col, self._turn)
             self.game_over()
+            self._snap_dirty = True
             return
 
+        # The board about to be replaced is the one the next player may 
+        # not recreate (the board after this move is only snapshotted 
+        # once something needs it)
+        if self._superko: 
+            self._prev_snaps.add(self._current_snapshot())
+        else: # In the Ko case, we'll only store the previous board
+            self._prev_snap_prev = self._current_snapshot()
+
         self._passes = 0
         self._board.place_piece(row, col, self._turn)
         self.capture(pos)
-
-        curr_board: Board = Board(self._side)
-        for i in range(self._side): 
-            for j in range(self._side): 
-                curr_board.place_piece(i, j, self._board.piece_at(i, j))
-            
-        if self._superko: 
-            self._prev_boards.append(curr_board)
-        else: # In the Ko case, we'll only store the most recent board
-            prev_board = self._prev_boards[1]
-            self._prev_boards[0] = prev_board
-            self._prev_boards[1] = curr_board
+        self._snap_dirty = True
         
         self.switch_turn()
 
+    def _current_snapshot(self) -> tuple[int, ...]:
+        """
+        Returns the snapshot of the current board, only building it if the 
+        board has changed since it was last requested
+        """
+        if self._snap_dirty or self._cached_snap is None:
+            self._cached_snap = self._board.snapshot()
+            self._snap_dirty = False
+
+        return self._cached_snap
+
+    def _apply_bits(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """
+        Computes the board snapshot that would result from the current
+        player placing a piece at pos, without building a new game
+
+        Args:
+            pos: An empty position on the board
+
+        Returns: The (player 1, player 2) bitboards after the move
+        """
+        row, col = pos
+        bit: int = 1 << (row * self._side + col)
+
+        own: int = self._board.pieces(self._turn) | bit
+        other: int = self._board.pieces(2 if self._turn == 1 else 1)
+
+        if row == 0 and col == 0: # The fake game over fills every empty spot
+            own |= self._board.empties()
+        else: # Mirrors capture
+            other &= ~self._board.neighbor_mask(row, col)
+
+        if self._turn == 1:
+            return (own, other)
+        else:
+            return (other, own)
+
+    def score_after_move(self, 
+                         pos: Optional[tuple[int, int]]) -> dict[int, int]:
+        """
+        Computes the scores that would result from the current player making
+        a move, without building a new game
+
+        Args:
+            pos: A legal position on the board, or None for a pass
+
+        Returns: Dictionary mapping player numbers to scores
+        """
+        if pos is None:
+            return self.scores()
+
+        p1, p2 = self._apply_bits(pos)
+        return {1: p1.bit_count(), 2: p2.bit_count()}
+
     def game_over(self) -> None:
         """
         Manages the fake mechanism for ending a game (placing a piece in
@@ -462,21 +543,8 @@ class GoFake(GoBase):
 
         Returns: Dictionary mapping player numbers to scores
         """
-        scores: dict[int, int] = {}
-        for player in range(1, self._players + 1):
-            scores[player] = 0
-
-        grid_board: list[list[Optional[int]]] = self._board.to_grid()
-
-        for row in grid_board:
-            for pos in row:
-                if pos is not None:
-                    if pos in scores:
-                        scores[pos] += 1
-                    else:
-                        scores[pos] = 1
-        
-        return scores
+        return {player: self._board.pieces(player).bit_count()
+                for player in range(1, self._players + 1)}
 
     def load_game(self, turn: int, grid: BoardGridType) -> None:
         """
@@ -529,17 +597,25 @@ class GoFake(GoBase):
         the method was called on, reflecting the state
         of the game after applying the provided move.
         """
-        # Creating a new GoBase and copying all relevant data into it
-        simulation: "GoBase" = GoFake(self._side, self._players, self._superko)
-        
-        for i in range(self._side):
-            for j in range(self._side): 
-                simulation._board.place_piece(i, j, self._board.piece_at(i, j))
-        # simulation._board = deepcopy(self._board)
-        
-        for i in range(len(self._prev_boards)): 
-            simulation._prev_boards.append(self._prev_boards[i])
-        # simulation._prev_boards = deepcopy(self._prev_boards)
+        # Reusing a recycled GoFake if there is one (otherwise creating a 
+        # bare one) and copying all relevant data into it
+        simulation: "GoFake"
+        if _sim_pool:
+            simulation = _sim_pool.pop()
+            simulation._board.copy_from(self._board)
+            simulation._moves_cache.clear()
+        else:
+            simulation = GoFake.__new__(GoFake)
+            simulation._board = self._board.copy()
+            simulation._moves_cache = {}
+
+        simulation._side = self._side
+        simulation._players = self._players
+        simulation._superko = self._superko
+        simulation._prev_snaps = set(self._prev_snaps)
+        simulation._prev_snap_prev = self._prev_snap_prev
+        simulation._cached_snap = self._cached_snap
+        simulation._snap_dirty = self._snap_dirty
         
         simulation._turn = self._turn
         simulation._game_over = self._game_over
@@ -551,6 +627,16 @@ class GoFake(GoBase):
             simulation.apply_move(pos)
         
         return simulation 
+
+    def recycle(self) -> None:
+        """
+        Hands a game returned by simulate_move back so that a later
+        simulation can reuse it. The game must not be used afterwards.
+
+        Returns: Nothing
+        """
+        if len(_sim_pool) < _SIM_POOL_MAX:
+            _sim_pool.append(self)
         
       
     def capture(self, pos: tuple[int, int]) -> None: 
@@ -560,15 +646,9 @@ class GoFake(GoBase):
         those pieces are captured
         """
         row, col = pos
+        own: Optional[int] = self._board.piece_at(row, col)
+        adjacent: int = self._board.neighbor_mask(row, col)
 
-        up = (row - 1, col)
-        down = (row + 1, col)
-        left = (row, col - 1)
-        right = (row, col + 1)
-        
-        liberties: list[tuple[int, int]] = [up, down, left, right]
-
-        for l in liberties: 
-            if 0 <= l[0] < self.size and 0 <= l[1] < self.size: 
-                if self._board.piece_at(l[0], l[1])!= self._board.piece_at(row, col): 
-                        self._board.remove_piece(l[0], l[1])
+        if own is not None:
+            adjacent &= ~self._board.pieces(own)
+        self._board.remove_pieces(adjacent)
@@ -5,14 +5,24 @@ from board import Board
 
 class Go(GoBase):
 
+    __slots__ = ("_prev_boards", "_prev_boards_set", "_turn", "_board",
+                 "_passes", "_moves_cache", "_legal_cache", "_scores_cache")
+
+    # Simulations handed back through recycle, reused by simulate_move
+    _POOL: list["Go"] = []
+    _POOL_MAX: int = 64
+
     _side: int
     _players: int
     _superko: bool
     _prev_boards: list[int]
+    _prev_boards_set: set[int]
     _turn: int
     _board: Board
     _passes: int
-    _done: bool
+    _moves_cache: dict[tuple[int, int], ListMovesType]
+    _legal_cache: dict[tuple[int, int, tuple[int, int]], bool]
+    _scores_cache: Optional[tuple[int, dict[int, int]]]
 
     def __init__(
         self,
@@ -22,12 +32,21 @@ class Go(GoBase):
     ):
         super().__init__(side, players, superko)
         self._turn = 1
-        self._board = Board(side)
+        self._board = Board(side, players)
         self._passes = 0
-        self._done = False
-        self._prev_states = []
         self._prev_boards = [hash(self._board), hash(self._board)]
 
+        # The hashes of _prev_boards, for checking superko in constant time
+        self._prev_boards_set = set(self._prev_boards)
+
+        # Results of available_moves and legal_move keyed on the board's 
+        # Zobrist hash and the turn; cleared whenever the history changes
+        self._moves_cache = {}
+        self._legal_cache = {}
+
+        # The last result of scores, with the Zobrist hash of its board
+        self._scores_cache = None
+
     @property
     def size(self) -> int:
         """
@@ -86,15 +105,18 @@ class Go(GoBase):
         If the game is over, this property will not return
         any meaningful value.
         """
-        moves: list[tuple[int, int]] = []
+        key: tuple[int, int] = (self._board.zobrist, self._turn)
+        moves: Optional[ListMovesType] = self._moves_cache.get(key)
 
-        for row in range(self.size): 
-            for col in range(self.size):
-                if (self.legal_move((row, col)) and 
-                    self._board.piece_at(row, col) is None): 
-                    moves.append((row, col))
+        if moves is None:
+            # Only the empty positions can be legal, so the rest of the 
+            # board is filtered out with one bitboard operation
+            empty: list[tuple[int, int]] = \
+                self._board.positions(self._board.empties())
+            moves = [pos for pos in empty if self.legal_move(pos)]
+            self._moves_cache[key] = moves
         
-        return moves
+        return list(moves)
     
 
     @property
@@ -119,19 +141,14 @@ class Go(GoBase):
         the list will contain more than one integer (representing
         the players who tied)
         """
-        winners: list[int] = []
         if not self.done: 
-            return winners
+            return []
         
-        max_score: int = 0
-        for player, score in self.scores().items(): 
-            if score == max_score:
-                winners.append(player)
-            if score > max_score: 
-                winners = [player]
-                max_score = score
-
-        return winners
+        scores: dict[int, int] = self.scores()
+        max_score: int = max(scores.values())
+
+        return [player for player, score in scores.items() 
+                if score == max_score]
     
     def switch_turn(self) -> None: 
         """
@@ -176,25 +193,34 @@ class Go(GoBase):
         """
         row, col = pos
 
-        temp_base: "Go"  = self.simulate_move(pos)
-
         if not (0 <= row < self.size and 0 <= col < self.size):
             return False
         
         if self.piece_at((row, col)) is not None:
             return False
-        
-        hashed_board: int = hash(temp_base._board)
+
+        key: tuple[int, int, tuple[int, int]] = (self._board.zobrist, 
+                                                 self._turn, pos)
+        legal: Optional[bool] = self._legal_cache.get(key)
+        if legal is not None:
+            return legal
+
+        # Making the move in place, reading the resulting hash, then undoing it
+        record: tuple[tuple[int, ...], int] = self._do_move(pos)
+        hashed_board: int = hash(self._board)
+        self._undo_move(record)
         
         if self._superko:
-            if hashed_board in self._prev_boards: 
-                return False
+            legal = hashed_board not in self._prev_boards_set
 
         else: # otherwise we are in ko case
-            if hashed_board == self._prev_boards[0]:
-                return False
+            legal = hashed_board != self._prev_boards[0]
+
+        if len(self._legal_cache) >= 2 * self.size * self.size:
+            self._legal_cache.clear()
+        self._legal_cache[key] = legal
         
-        return True 
+        return legal
     
 
     def apply_move(self, pos: Optional[tuple[int, int]]) -> None:
@@ -224,18 +250,16 @@ class Go(GoBase):
             self.pass_turn()
             return
         
-        row, col = pos
-
         self._passes = 0
-        self._board.place_piece(row, col, self._turn)
-        self.capture(pos)
-        for neighbor in self.get_neighbors(pos):
-            self.capture(neighbor)
+        self._do_move(pos)
+        self._moves_cache.clear()
+        self._legal_cache.clear()
 
         curr_board: int = hash(self._board)
             
         if self._superko: 
             self._prev_boards.append(curr_board)
+            self._prev_boards_set.add(curr_board)
         else: # In the Ko case, we'll only store the most recent board
             prev_board = self._prev_boards[1]
             self._prev_boards[0] = prev_board
@@ -244,64 +268,76 @@ class Go(GoBase):
         self.switch_turn()
 
 
+    def _do_move(self, pos: tuple[int, int]) -> tuple[tuple[int, ...], int]:
+        """
+        Places a piece of the current player on the board and resolves the
+        captures, without changing the turn, passes or board history
+
+        Args:
+            pos: An empty position on the board
+
+        Returns: A record of the board before the move, for _undo_move
+        """
+        record: tuple[tuple[int, ...], int] = (self._board.snapshot(), 
+                                               self._board.zobrist)
+        row, col = pos
+
+        self._board.place_piece(row, col, self._turn)
+        self.capture(pos)
+        for neighbor in self.get_neighbors(pos):
+            self.capture(neighbor)
+
+        return record
+
+
+    def _undo_move(self, record: tuple[tuple[int, ...], int]) -> None:
+        """
+        Takes back a move made by _do_move, restoring the placed and 
+        captured pieces
+
+        Args:
+            record: The record returned by _do_move
+        """
+        self._board.restore(*record)
+
+
     def capture(self, pos: tuple[int, int]) -> None: 
         """
         If a move captures an opponent's piece(s)
         """
+        own: Optional[int] = self.piece_at(pos)
+
         for neighbor in self.get_neighbors(pos): 
+            piece: Optional[int] = self.piece_at(neighbor)
 
-            to_capture: set[tuple[int, int]] = set()
-
-            if self.piece_at(neighbor) != None and \
-                            self.piece_at(neighbor) != self.piece_at(pos):
-                to_capture.add(neighbor)
-                # Updates to_capture destructively
-                if not self.has_liberties(neighbor, to_capture): 
-                    for loc in to_capture: 
-                        row, col = loc
-                        self._board.remove_piece(row, col)
-                to_capture = set()
+            if piece is not None and piece != own:
+                if not self.has_liberties(neighbor): 
+                    self._board.remove_pieces(self._board.group_at(*neighbor))
     
 
-    def has_liberties(self, pos: tuple[int, int], targeted: set) -> bool:
+    def has_liberties(self, pos: tuple[int, int]) -> bool:
         """
         If a piece or any of its chained neighbors have liberties
-        Destructively updates targeted set to mark which locations must be deleted
+        The chain is grown one ring of neighbors at a time on the bitboards,
+        stopping as soon as it touches an empty position
         """
-        neighbor_liberties: bool = False
-
-        for neighbor in self.get_neighbors(pos):
-            if self.piece_at(neighbor) is None:
-                return True
-            if self.piece_at(neighbor) == self.piece_at(pos) and \
-                                                    not neighbor in targeted:
-                targeted.add(neighbor)
-                if self.has_liberties(neighbor, targeted):
-                    neighbor_liberties = True
-                    break
-        
-        return neighbor_liberties
-
-    
-    def get_neighbors(self, pos: tuple[int, int]) -> set[tuple[int, int]]: 
         row, col = pos
-        neighbors: set[tuple[int, int]] = set()
+        board: Board = self._board
+        piece: Optional[int] = board.piece_at(row, col)
+        if piece is None:
+            return True
 
-        up = (row - 1, col)
-        down = (row + 1, col)
-        left = (row, col - 1)
-        right = (row, col + 1)
-        
-        if up[0] >= 0: 
-            neighbors.add(up)
-        if down[0] < self.size: 
-            neighbors.add(down)
-        if left[1] >= 0: 
-            neighbors.add(left)
-        if right[1] < self.size: 
-            neighbors.add(right)
+        return board.reaches(1 << (row * self.size + col), 
+                             board.pieces(piece), board.empties())
 
-        return neighbors
+    
+    def get_neighbors(self, 
+                      pos: tuple[int, int]) -> tuple[tuple[int, int], ...]: 
+        """
+        Returns the positions adjacent to pos, from the board's precomputed
+        neighbor table
+        """
+        return self._board.neighbors(pos[0], pos[1])
 
     def pass_turn(self) -> None:
         """
@@ -321,21 +357,36 @@ class Go(GoBase):
         """
         Computes the current score for each player ()
 
+        A position counts for a player if it holds one of their pieces, or
+        if the region of the player's non-pieces containing it does not
+        reach all four edges of the board (the same rule as in_territory).
+        Each region is flooded once, instead of once per position.
+
         Returns: Dictionary mapping player numbers to scores
         """
+        board: Board = self._board
+
+        if self._scores_cache is not None and \
+                self._scores_cache[0] == board.zobrist:
+            return dict(self._scores_cache[1])
+
         scores: dict[int, int] = {}
+        edges: tuple[int, int, int, int] = board.edge_masks()
 
         for player in range(1, self._players + 1):
-            scores[player] = 0
-            for i in range(self.size):
-                for j in range(self.size):
-                    vis: set = set()
-                    sides: set = set()
-                    if self.in_territory(player, (i, j), vis, sides):
-                        scores[player] += 1
-                        
-    
-        return scores
+            own: int = board.pieces(player)
+            scores[player] = own.bit_count()
+
+            unvisited: int = board.full() & ~own
+            while unvisited:
+                region: int = board.flood(unvisited & -unvisited, unvisited)
+                unvisited &= ~region
+
+                if not all(region & edge for edge in edges):
+                    scores[player] += region.bit_count()
+
+        self._scores_cache = (board.zobrist, scores)
+        return dict(scores)
 
     def load_game(self, turn: int, grid: list[list[int]]) -> None:
         """
@@ -363,18 +414,42 @@ class Go(GoBase):
 
         Returns: None
         """
-        new_board: Board = Board(self.size)
-        new_board.board = grid
+        new_board: Board = Board(self.size, self._players)
+        new_board.load_grid(grid)
 
         #Erase previous history
         self._prev_boards = [hash(new_board), hash(new_board)]
+        self._prev_boards_set = set(self._prev_boards)
         self._passes = 0
+        self._moves_cache.clear()
+        self._legal_cache.clear()
         
         #Load in new game information
         self._board = new_board
         self._turn = turn
     
 
+    def score_after_move(self, 
+                         pos: Optional[tuple[int, int]]) -> dict[int, int]:
+        """
+        Computes the scores that would result from the current player making
+        a move, without altering the state of the game
+
+        Args:
+            pos: A legal position on the board, or None for a pass
+
+        Returns: Dictionary mapping player numbers to scores
+        """
+        if pos is None:
+            return self.scores()
+
+        record: tuple[tuple[int, ...], int] = self._do_move(pos)
+        scores: dict[int, int] = self.scores()
+        self._undo_move(record)
+
+        return scores
+
+
     def simulate_move(self, pos: Optional[tuple[int, int]]) -> "Go":
         """
         Simulates the effect of making a move
@@ -398,18 +473,14 @@ class Go(GoBase):
         the method was called on, reflecting the state
         of the game after applying the provided move.
         """
-        # Creating a new Go game and copying all relevant data into it
-        simulation: "Go" = Go(self._side, self._players, self._superko)
-        
-        for i in range(self._side): 
-            for j in range(self._side): 
-                simulation.board.place_piece(i, j, self._board.piece_at(i, j))
-        
-        for i in range(len(self._prev_boards)): 
-            simulation._prev_boards.append(self._prev_boards[i])
-        
-        simulation._turn = self._turn
-        simulation._passes = self._passes
+        # Reusing a recycled Go game if there is one (otherwise creating a 
+        # new one) and copying all relevant data into it
+        simulation: "Go"
+        if Go._POOL:
+            simulation = Go._POOL.pop()
+        else:
+            simulation = Go(self._side, self._players, self._superko)
+        simulation._reset_from(self)
 
         if pos is None:
             simulation.pass_turn()
@@ -418,11 +489,44 @@ class Go(GoBase):
         
         return simulation 
     
+    def _reset_from(self, other: "Go") -> None:
+        """
+        Overwrites this game with the state of another game, reusing this
+        game's board and containers
+
+        Args:
+            other: The game to copy
+        """
+        self._side = other._side
+        self._players = other._players
+        self._superko = other._superko
+        self._board.copy_from(other._board)
+        self._prev_boards[:] = other._prev_boards
+        self._prev_boards_set.clear()
+        self._prev_boards_set.update(other._prev_boards_set)
+        self._turn = other._turn
+        self._passes = other._passes
+
+        # The caches depend on the history, except for the scores
+        self._moves_cache.clear()
+        self._legal_cache.clear()
+        self._scores_cache = other._scores_cache
+
+    def recycle(self) -> None:
+        """
+        Hands a game returned by simulate_move back so that a later
+        simulation can reuse it. The game must not be used afterwards.
+
+        Returns: Nothing
+        """
+        if len(Go._POOL) < Go._POOL_MAX:
+            Go._POOL.append(self)
+    
     def in_territory(self, 
                      player: int, 
                      pos: tuple[int, int], 
-                     visited: set[tuple[int, int]] = set(),
-                     edges_reached: set[str] = set()) -> bool:
+                     visited: Optional[set[tuple[int, int]]] = None,
+                     edges_reached: Optional[set[str]] = None) -> bool:
         """
         Returns if a position is in the territory of a player (for two players)
 
@@ -441,40 +545,34 @@ class Go(GoBase):
         if self.piece_at(pos) == player: # Base case; returns True
             return True
 
-        neighbors: list[bool] = []
-
-        for i in {-1, 1}: # Checking the top and bottom neighbors
-            neighbor_pos: tuple[int, int] = (pos[0] + i, pos[1])
-
-            if not neighbor_pos in visited:
-                if not (0 <= neighbor_pos[0] < self.size):
-                    if i == 1:
-                        edges_reached.add("top")
-                    if i == -1:
-                        edges_reached.add("bottom")
-                        
-                else:
-                    visited.add(neighbor_pos)
-                    neighbors.append(self.in_territory(player, neighbor_pos, 
-                                                        visited, edges_reached))
-
-        for j in {-1, 1}: # Checking the right and left neighbors
-            neighbor_pos: tuple[int, int] = (pos[0], pos[1] + j)
-
-            if not neighbor_pos in visited:
-                if not (0 <= neighbor_pos[1] < self.size):
-                    if j == 1:
-                        edges_reached.add("right")
-                    if j == -1:
-                        edges_reached.add("left")
-                        
-                else:
-                    visited.add(neighbor_pos)
-                    neighbors.append(self.in_territory(player, neighbor_pos, 
-                                                        visited, edges_reached))
+        # Fresh sets for every call, so no state is shared between calls
+        if visited is None:
+            visited = set()
+        if edges_reached is None:
+            edges_reached = set()
+
+        # Flooding outwards from pos with an explicit stack, stopping at the
+        # player's pieces and noting which edges of the board are reached
+        last: int = self.size - 1
+        stack: list[tuple[int, int]] = [pos]
+
+        while stack:
+            row, col = stack.pop()
+
+            if row == last:
+                edges_reached.add("top")
+            if row == 0:
+                edges_reached.add("bottom")
+            if col == last:
+                edges_reached.add("right")
+            if col == 0:
+                edges_reached.add("left")
+
+            for neighbor in self.get_neighbors((row, col)):
+                if not neighbor in visited:
+                    visited.add(neighbor)
+                    if self.piece_at(neighbor) != player:
+                        stack.append(neighbor)
         
         # Reaching all four edges means a territory is not valid
-        if len(edges_reached) == 4 or False in neighbors: 
-            return False
-        
-        return True
+        return len(edges_reached) != 4
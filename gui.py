@@ -53,6 +53,13 @@ class DisplayGame:
     font: pygame.font.Font
     num_players: int
     super_ko: bool
+    _pass_rect: pygame.Rect
+    _label_cache: dict[tuple[str, tuple[int, int, int],
+                             Optional[tuple[int, int, int]]],
+                       pygame.surface.Surface]
+    _dirty: bool
+    _end_surface: Optional[pygame.surface.Surface]
+    _hovered: Optional[tuple[int, int]]
     pygame.mixer.music.play(-1)
 
     def __init__(self, size, num_players, super_ko, bot):
@@ -87,8 +94,51 @@ class DisplayGame:
                                                 self.total_width))
         self.clock = pygame.time.Clock()
 
+        # Rendered text labels, keyed on their text and colors
+        self._label_cache = {}
+
+        # The window is only redrawn when _dirty is set, which happens when
+        # the game changes or the mouse moves onto another address
+        self._dirty = True
+        self._hovered = None
+
+        # The game over scene, drawn the first time it is needed
+        self._end_surface = None
+
+        # The "Pass" button never moves, so it is measured once here and
+        # used for both drawing it and hit-testing clicks
+        label = self._label("Pass", bg = WHITE)
+        self._pass_rect = pygame.Rect(
+            (self.total_width - label.get_width()) // 2,
+            self.total_width - ((BORDER + label.get_height()) // 2),
+            label.get_width(), label.get_height())
+
         self.event_loop()
 
+    def _label(self, text: str, fg: tuple[int, int, int] = BLACK, 
+               bg: Optional[tuple[int, int, int]] = None) -> \
+        pygame.surface.Surface:
+        """
+        Renders a text label, reusing the surface if the same label was
+        rendered before
+
+        Parameters:
+            text : str : the text of the label
+            fg : tuple[int, int, int] : the color of the text
+            bg : Optional[tuple[int, int, int]] : the background color, or 
+                None for a transparent background
+
+        Returns : pygame.surface.Surface : the rendered label
+        """
+        key = (text, fg, bg)
+        label: Optional[pygame.surface.Surface] = self._label_cache.get(key)
+
+        if label is None:
+            label = self.font.render(text, True, fg, bg)
+            self._label_cache[key] = label
+
+        return label
+
     def draw_grid(self) -> None:
         """
         Draws the grid, for a certain size
@@ -123,7 +173,7 @@ class DisplayGame:
 
         Returns: nothing
         """
-        label = self.font.render(f"Player {self.go.turn} to move", True, BLACK)
+        label = self._label(f"Player {self.go.turn} to move")
         text_topleft = ((self.total_width - label.get_width()) // 2,
                         (BORDER - label.get_height()) // 2)
         self.surface.blit(label, text_topleft)
@@ -137,13 +187,10 @@ class DisplayGame:
 
         Returns: the rectangle that was drawn
         """
-        label = self.font.render("Pass", True, BLACK, WHITE)
-        text_topleft = ((self.total_width - label.get_width()) // 2,
-                        self.total_width - ((BORDER + label.get_height()) // 2))
-        self.surface.blit(label, text_topleft)
+        label = self._label("Pass", bg = WHITE)
+        self.surface.blit(label, self._pass_rect.topleft)
 
-        return pygame.Rect(text_topleft[0], text_topleft[1], label.get_width(), 
-                           label.get_height())
+        return self._pass_rect
 
     def draw_game_over(self) -> None:
         """
@@ -153,27 +200,35 @@ class DisplayGame:
 
         Returns: nothing
         """
-        self.surface.fill(BROWN)
-        str_outcomes: list[str] = [str(player) for player in
-                                    self.go.outcome]
+        # The final scene can't change, so it is drawn once onto its own 
+        # surface and then just copied onto the window
+        if self._end_surface is None:
+            end_surface = pygame.Surface((self.total_width, self.total_width))
+            end_surface.fill(BROWN)
+            str_outcomes: list[str] = [str(player) for player in
+                                        self.go.outcome]
 
-        # The winner(s)
-        if len(str_outcomes) == 1:
-            label = self.font.render(f"Player {str_outcomes[0]} wins", True, BLACK)
-        else:
-            winners: str = " and ".join(str_outcomes)
-            label = self.font.render(f"Players {winners} win", True, BLACK)
+            # The winner(s)
+            if len(str_outcomes) == 1:
+                label = self._label(f"Player {str_outcomes[0]} wins")
+            else:
+                winners: str = " and ".join(str_outcomes)
+                label = self._label(f"Players {winners} win")
 
 
-        text_topleft = ((self.total_width - label.get_width()) // 2,
-                        self.total_width // 2 - (2 * label.get_height()))
-        self.surface.blit(label, text_topleft)
+            text_topleft = ((self.total_width - label.get_width()) // 2,
+                            self.total_width // 2 - (2 * label.get_height()))
+            end_surface.blit(label, text_topleft)
 
-        # The scores
-        label = self.font.render(f"Scores: {self.go.scores()}", True, BLACK)
-        text_topleft = ((self.total_width - label.get_width()) // 2,
-                        self.total_width // 2)
-        self.surface.blit(label, text_topleft)
+            # The scores
+            label = self._label(f"Scores: {self.go.scores()}")
+            text_topleft = ((self.total_width - label.get_width()) // 2,
+                            self.total_width // 2)
+            end_surface.blit(label, text_topleft)
+
+            self._end_surface = end_surface
+
+        self.surface.blit(self._end_surface, (0, 0))
 
     def draw_game(self) -> None:
         """
@@ -184,7 +239,7 @@ class DisplayGame:
         Returns: nothing
         """
         if self.go.done:
-            self.draw_game_over
+            self.draw_game_over()
 
         else:
             self.surface.fill(BROWN)
@@ -203,7 +258,7 @@ class DisplayGame:
 
             if hovered_address is not None:
                 if self.go.piece_at(hovered_address) is None:
-                    if hovered_address in self.go.available_moves:
+                    if self.go.legal_move(hovered_address):
                         self.draw_piece(self.to_coordinates((hovered_address)), self.go.turn)
 
     def to_coordinates(self, address: tuple[int, int]) -> tuple[int, int]:
@@ -230,11 +285,14 @@ class DisplayGame:
 
         Returns : tuple[int, int] : the address
         """
-        for i in range(self.size):
-            for j in range(self.size):
-                if math.dist(location, self.to_coordinates((i, j))) <= \
-                    PIECE_RADIUS:
-                    return (i, j)
+        # Inverting to_coordinates gives the only address close enough to
+        # the location, so just that one is checked
+        i: int = round((location[0] - BORDER) / BOX_SIZE)
+        j: int = round((location[1] - BORDER) / BOX_SIZE)
+
+        if 0 <= i < self.size and 0 <= j < self.size and \
+            math.dist(location, self.to_coordinates((i, j))) <= PIECE_RADIUS:
+            return (i, j)
         return None
 
     def get_position(self, location: tuple[int, int]) -> \
@@ -250,7 +308,7 @@ class DisplayGame:
         the "pass" button, or None
         """
         # If the location is the "pass" button
-        if self.draw_pass_turn().collidepoint(location[0], location[1]):
+        if self._pass_rect.collidepoint(location[0], location[1]):
             return "pass"
 
         # If the location is an unoccupied address on the board
@@ -278,7 +336,18 @@ class DisplayGame:
                     pygame.quit()
                     sys.exit()
 
+                if event.type == pygame.VIDEOEXPOSE:
+                    self._dirty = True
+
+                if event.type == pygame.MOUSEMOTION:
+                    hovered: Optional[tuple[int, int]] = \
+                        self.to_address(event.pos)
+                    if hovered != self._hovered:
+                        self._hovered = hovered
+                        self._dirty = True
+
                 if event.type == pygame.MOUSEBUTTONUP and not self.go.done:
+                    self._dirty = True
                     clicked: Optional[tuple[int, int] | str] = \
                         self.get_position(event.pos)
                     
@@ -293,14 +362,14 @@ class DisplayGame:
                 
                 if self.bot and self.go.turn == 2:
                     self.go.apply_move(minimax_move(self.go))
+                    self._dirty = True
                     #self.go.apply_move(random_move(self.go))
-
-                if self.go.done:
-                    self.draw_game_over()
                 
-            # Update the display
-            self.draw_game()
-            pygame.display.update()
+            # Update the display, if anything on it changed
+            if self._dirty:
+                self.draw_game()
+                pygame.display.update()
+                self._dirty = False
             self.clock.tick(24)
 
 @click.command()
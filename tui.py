@@ -6,6 +6,12 @@ from go import Go
 from board import Board
 from bot import minimax_move
 
+# Box-drawing glyphs for empty intersections, indexed by the kind of row and
+# column they are on (0 = first, 1 = middle, 2 = last)
+GLYPHS: list[list[str]] = [["┌", "─┬", "─┐\n"],
+                           ["├", "─┼", "─┤\n"],
+                           ["└", "─┴", "─┘\n"]]
+
 def print_board(grid: list[list[Optional[int]]], num_players: int):
     """
     Prints the state of the board as a grid of strings.
@@ -14,47 +20,30 @@ def print_board(grid: list[list[Optional[int]]], num_players: int):
     """
     nrows: int = len(grid)
     ncols: int = len(grid[0])
+    last_row: int = nrows - 1
+    last_col: int = ncols - 1
 
-    crow: str = ""
+    parts: list[str] = []
     for r in range(nrows):
+        # 0 for the first row/column, 2 for the last, 1 for the ones between
+        row_kind: int = 0 if r == 0 else 2 if r == last_row else 1
+
         for c in range(ncols):
             v = grid[r][c]
 
             if v is not None: #adding player piece or middle board piece
                 if c != 0:
-                    crow += "-"
-                for i in range(0, num_players+1):
-                    if v == i:
-                        crow += str(i)
-                if c == ncols -1:
-                    crow += "\n"
-
-            elif r == 0: #top edge piece
-                if c == 0:
-                    crow += "┌"
-                elif c == ncols-1:
-                    crow += "─┐\n"
-                else:
-                    crow += "─┬"
-
-            elif r == nrows-1: #bottom edge piece
-                if c == ncols-1:
-                    crow += "─┘\n"
-                elif c == 0:
-                    crow += "└"
-                else:
-                    crow += "─┴"
-
-            elif c == 0: #left edge piece
-                crow += "├"
-
-            elif c == ncols-1: #right edge piece
-                crow += "─┤\n"
+                    parts.append("-")
+                if 0 <= v <= num_players:
+                    parts.append(str(v))
+                if c == last_col:
+                    parts.append("\n")
 
-            else:
-                crow += "─┼"
+            else: #edge or middle board intersection
+                col_kind: int = 0 if c == 0 else 2 if c == last_col else 1
+                parts.append(GLYPHS[row_kind][col_kind])
 
-    return crow
+    return "".join(parts)
 
 def go_game_initiator(num_players, size, super_ko):
     """